@@ -46,6 +46,12 @@ fi
 STORAGE_FILE="/home/$CURRENT_USER/.config/Cursor/User/globalStorage/storage.json"
 BACKUP_DIR="/home/$CURRENT_USER/.config/Cursor/User/globalStorage/backups"
 
+# Detect optional tools once instead of searching PATH at every use
+HAS_JQ=false
+command -v jq &> /dev/null && HAS_JQ=true
+HAS_CHATTR=false
+command -v chattr &> /dev/null && HAS_CHATTR=true
+
 # Display security warning and get confirmation
 show_security_warning() {
     echo
@@ -77,12 +83,46 @@ check_permissions() {
     fi
 }
 
+# Wait up to $1 seconds for Cursor to exit, returning as soon as it is gone
+# instead of sleeping for the whole period. Leaves survivors in CURSOR_PIDS.
+wait_for_cursor_exit() {
+    # Times are in tenths of a second; checks start at 0.1s and back off to 1s
+    local budget=$(( $1 * 10 ))
+    local elapsed=0
+    local interval=1
+    local pid survivors
+    
+    while [ "$elapsed" -lt "$budget" ]; do
+        sleep "$((interval / 10)).$((interval % 10))"
+        elapsed=$((elapsed + interval))
+        
+        # Probe the PIDs we already know about rather than rescanning all processes
+        survivors=""
+        for pid in $CURSOR_PIDS; do
+            if kill -0 "$pid" 2>/dev/null; then
+                survivors="$survivors $pid"
+            fi
+        done
+        CURSOR_PIDS="${survivors# }"
+        
+        if [ -z "$CURSOR_PIDS" ]; then
+            return 0
+        fi
+        interval=$(( interval * 2 > 10 ? 10 : interval * 2 ))
+    done
+    return 1
+}
+
 # Check and gently close Cursor process
 check_and_close_cursor() {
     log_info "Checking for running Cursor processes..."
     
     # Use more precise method to find Cursor process
-    CURSOR_PIDS=$(ps aux | grep -E "/[C]ursor|[C]ursor$" | awk '{print $2}' || true)
+    # Take one process snapshot and reuse it for both the PID list and the display;
+    # pgrep matches command lines in a single pass and never matches itself
+    local cursor_procs
+    cursor_procs=$(pgrep -af "/Cursor|Cursor$" || true)
+    CURSOR_PIDS=$(awk '{print $1}' <<< "$cursor_procs")
     
     if [ -z "$CURSOR_PIDS" ]; then
         log_info "No running Cursor process found"
@@ -90,7 +130,7 @@ check_and_close_cursor() {
     fi
     
     log_warn "Found running Cursor processes"
-    ps aux | grep -E "/[C]ursor|[C]ursor$" || true
+    echo "$cursor_procs"
     
     echo
     log_warn "It is recommended to close Cursor normally before proceeding"
@@ -109,23 +149,17 @@ check_and_close_cursor() {
         while [ $attempt -le $max_attempts ]; do
             log_info "Sending normal termination signal to Cursor (attempt $attempt/$max_attempts)..."
             
-            # Send SIGTERM to each PID
-            for pid in $CURSOR_PIDS; do
-                kill "${pid}" 2>/dev/null || true
-            done
+            # Send SIGTERM to all PIDs in a single call
+            kill $CURSOR_PIDS 2>/dev/null || true
             
-            # Wait a moment and check if processes are still running
-            sleep 3
-            CURSOR_PIDS=$(ps aux | grep -E "/[C]ursor|[C]ursor$" | awk '{print $2}' || true)
-            
-            if [ -z "$CURSOR_PIDS" ]; then
+            # Wait for the processes to exit, checking periodically
+            if wait_for_cursor_exit 5; then
                 log_info "Cursor has been closed successfully"
                 return 0
             fi
             
-            log_warn "Cursor is still running, waiting a bit longer..."
+            log_warn "Cursor is still running, retrying..."
             ((attempt++))
-            sleep 2
         done
         
         # If we get here, normal termination failed
@@ -141,15 +175,10 @@ check_and_close_cursor() {
     
     # Force option selected or normal close failed and force approved
     log_warn "Attempting to forcibly terminate Cursor processes..."
-    for pid in $CURSOR_PIDS; do
-        log_warn "Force terminating process PID: ${pid}..."
-        kill -9 "${pid}" 2>/dev/null || true
-    done
-    
-    sleep 2
-    CURSOR_PIDS=$(ps aux | grep -E "/[C]ursor|[C]ursor$" | awk '{print $2}' || true)
+    log_warn "Force terminating process PIDs: ${CURSOR_PIDS//$'\n'/ }..."
+    kill -9 $CURSOR_PIDS 2>/dev/null || true
     
-    if [ -z "$CURSOR_PIDS" ]; then
+    if wait_for_cursor_exit 2; then
         log_info "Cursor has been forcibly terminated"
         return 0
     else
@@ -192,7 +221,7 @@ backup_config() {
     if [ -f "$STORAGE_FILE" ] && [ ! -w "$STORAGE_FILE" ]; then
         log_warn "Cannot write to configuration file, attempting to fix permissions..."
         # Try to fix permissions
-        if command -v chattr &> /dev/null; then
+        if [ "$HAS_CHATTR" = true ]; then
             chattr -i "$STORAGE_FILE" 2>/dev/null || true
         fi
         chmod 644 "$STORAGE_FILE" 2>/dev/null || {
@@ -219,6 +248,18 @@ backup_config() {
     fi
 }
 
+# Print the most recently modified configuration backup
+latest_config_backup() {
+    local latest="" backup
+    for backup in "$BACKUP_DIR"/storage.json.backup_*; do
+        [ -f "$backup" ] || continue
+        if [ -z "$latest" ] || [ "$backup" -nt "$latest" ]; then
+            latest="$backup"
+        fi
+    done
+    echo "$latest"
+}
+
 # Generate random ID
 generate_random_id() {
     # Linux can use /dev/urandom
@@ -227,8 +268,14 @@ generate_random_id() {
 
 # Generate random UUID
 generate_uuid() {
-    # Linux uses uuidgen command
-    uuidgen | tr '[:upper:]' '[:lower:]'
+    # Read the kernel's UUID source directly (already lowercase), no fork needed
+    local uuid
+    if read -r uuid 2>/dev/null < /proc/sys/kernel/random/uuid; then
+        echo "$uuid"
+    else
+        # Fall back to uuidgen command
+        uuidgen | tr '[:upper:]' '[:lower:]'
+    fi
 }
 
 # Generate new configuration
@@ -239,7 +286,8 @@ generate_new_config() {
         exit 1
     fi
     
-    if ! command -v uuidgen &> /dev/null; then
+    # uuidgen is only needed when the kernel UUID source is unavailable
+    if [ ! -r /proc/sys/kernel/random/uuid ] && ! command -v uuidgen &> /dev/null; then
         log_error "uuidgen command not found, please install uuidgen using apt-get install uuid-runtime"
         exit 1
     fi
@@ -263,7 +311,8 @@ generate_new_config() {
     if [ "$modify_machine_id" = "1" ]; then
         if [ -f "/etc/machine-id" ]; then
             log_info "Modifying system machine-id..."
-            local new_machine_id=$(uuidgen | tr -d '-')
+            local new_machine_id=$(generate_uuid)
+            new_machine_id=${new_machine_id//-/}
             
             # Backup original machine-id
             backup_system_id
@@ -283,12 +332,13 @@ generate_new_config() {
     local machine_id="auth0|user_$(generate_random_id | cut -c 1-32)"
     
     local mac_machine_id=$(generate_random_id)
-    local device_id=$(generate_uuid | tr '[:upper:]' '[:lower:]')
-    local sqm_id="{$(generate_uuid | tr '[:lower:]' '[:upper:]')}"
+    local device_id=$(generate_uuid)
+    local sqm_uuid=$(generate_uuid)
+    local sqm_id="{${sqm_uuid^^}}"
     
     # Enhanced escape function
     escape_sed_replacement() {
-        echo "$1" | sed -e 's/[\/&]/\\&/g'
+        echo "$1" | sed -e 's/[\/&|]/\\&/g'
     }
 
     # Escape variables
@@ -297,18 +347,19 @@ generate_new_config() {
     device_id_escaped=$(escape_sed_replacement "$device_id")
     sqm_id_escaped=$(escape_sed_replacement "$sqm_id")
 
-    # Make a temporary copy to work with
+    # Write the edited copy straight to a temporary file
     local temp_file=$(mktemp)
-    cp "$STORAGE_FILE" "$temp_file"
 
-    # Use enhanced regular expressions and escape
-    sed -i "s|\"telemetry\.machineId\": *\"[^\"]*\"|\"telemetry.machineId\": \"${machine_id_escaped}\"|" "$temp_file"
-    sed -i "s|\"telemetry\.macMachineId\": *\"[^\"]*\"|\"telemetry.macMachineId\": \"${mac_machine_id_escaped}\"|" "$temp_file"
-    sed -i "s|\"telemetry\.devDeviceId\": *\"[^\"]*\"|\"telemetry.devDeviceId\": \"${device_id_escaped}\"|" "$temp_file"
-    sed -i "s|\"telemetry\.sqmId\": *\"[^\"]*\"|\"telemetry.sqmId\": \"${sqm_id_escaped}\"|" "$temp_file"
+    # Use enhanced regular expressions and escape; apply all replacements in a single pass
+    sed \
+        -e "s|\"telemetry\.machineId\": *\"[^\"]*\"|\"telemetry.machineId\": \"${machine_id_escaped}\"|" \
+        -e "s|\"telemetry\.macMachineId\": *\"[^\"]*\"|\"telemetry.macMachineId\": \"${mac_machine_id_escaped}\"|" \
+        -e "s|\"telemetry\.devDeviceId\": *\"[^\"]*\"|\"telemetry.devDeviceId\": \"${device_id_escaped}\"|" \
+        -e "s|\"telemetry\.sqmId\": *\"[^\"]*\"|\"telemetry.sqmId\": \"${sqm_id_escaped}\"|" \
+        "$STORAGE_FILE" > "$temp_file"
 
     # Verify the temp file before moving it to the actual location
-    if command -v jq &> /dev/null; then
+    if [ "$HAS_JQ" = true ]; then
         if ! jq empty "$temp_file" &> /dev/null; then
             log_error "Temporary file format error, modifications aborted"
             rm "$temp_file"
@@ -337,7 +388,7 @@ generate_new_config() {
         log_info "Set read-only permissions on configuration file"
         
         # Set immutable if requested
-        if [ "$perm_choice" = "2" ] && command -v chattr &> /dev/null; then
+        if [ "$perm_choice" = "2" ] && [ "$HAS_CHATTR" = true ]; then
             chattr +i "$STORAGE_FILE" 2>/dev/null && \
             log_info "Configuration file set as immutable" || \
             log_warn "Failed to set immutable attribute"
@@ -353,12 +404,12 @@ generate_new_config() {
 
     # Verify configuration after all modifications
     log_info "Verifying configuration file validity..."
-    if ! command -v jq &> /dev/null; then
+    if [ "$HAS_JQ" != true ]; then
         log_warn "jq command not found, skipping JSON validation"
     else
         if ! jq empty "$STORAGE_FILE" &> /dev/null; then
             log_error "Configuration file format error, restoring backup..."
-            cp "$(ls -t "$BACKUP_DIR"/storage.json.backup_* | head -1)" "$STORAGE_FILE"
+            cp "$(latest_config_backup)" "$STORAGE_FILE"
             chmod 644 "$STORAGE_FILE"
             chown "$CURRENT_USER:$CURRENT_USER" "$STORAGE_FILE"
             exit 1
@@ -382,7 +433,7 @@ show_file_tree() {
         if [ ${#backup_files[@]} -gt 0 ] && [ -e "${backup_files[0]}" ]; then
             for file in "${backup_files[@]}"; do
                 if [ -f "$file" ]; then
-                    echo "│       └── $(basename "$file")"
+                    echo "│       └── ${file##*/}"
                 fi
             done
         else
@@ -450,7 +501,7 @@ disable_auto_update() {
         echo "1) Yes - Also set immutable attribute"
         read -r immutable_choice
         
-        if [ "$immutable_choice" = "1" ] && command -v chattr &> /dev/null; then
+        if [ "$immutable_choice" = "1" ] && [ "$HAS_CHATTR" = true ]; then
             chattr +i "$updater_path" 2>/dev/null && \
             log_info "Update blocker file set as immutable" || \
             log_warn "Failed to set immutable attribute, but file is still read-only"
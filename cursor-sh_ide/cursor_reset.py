@@ -1,3 +1,4 @@
+import argparse
 import os
 import shutil
 import json
@@ -5,29 +6,68 @@ import uuid
 import sys
 from datetime import datetime
 
+# Cursor configuration locations, resolved once at import
+STORAGE_PATH = os.path.expanduser("~/.config/Cursor/User/globalStorage/storage.json")
+STORAGE_BACKUP_DIR = os.path.expanduser("~/.config/Cursor/User/globalStorage/backups")
+UPDATER_PATH = os.path.expanduser("~/.config/cursor-updater")
+BACKUP_ROOT = os.path.expanduser("~/cursor_config_backups")
+CONFIG_DIRECTORIES = [
+    os.path.expanduser("~/.cursor"),
+    os.path.expanduser("~/.config/Cursor"),
+    UPDATER_PATH
+]
+
+# Static prompt text, rendered once and printed with a single call
+SECURITY_WARNING = """
+⚠️  SECURITY AND STABILITY WARNING ⚠️
+This script will make changes to your Cursor IDE configuration:
+1. It can delete configuration files, which may remove your preferences
+2. It can modify identification settings which may affect licensing
+
+These changes may have the following impacts:
+- Loss of preferences, settings, and history
+- Potential issues with future Cursor updates
+- Cursor might need to be reinstalled or reconfigured"""
+
+MAIN_MENU = """
+Cursor IDE is installed. Choose an option:
+1. Remove all configuration files and uninstall Cursor
+2. Modify configuration settings (update storage.json with random IDs)"""
+
+def read_input(prompt):
+    """Read one line of input; running out of input cancels the operation."""
+    try:
+        return input(prompt).strip()
+    except EOFError:
+        print("\nNo input available, operation cancelled (use --action/--yes for unattended runs)")
+        sys.exit(1)
+
+def confirm(prompt, assume_yes=False):
+    """Ask a yes/no question; only an explicit "yes" counts as agreement."""
+    if assume_yes:
+        return True
+    return read_input(f"\n{prompt} (yes/no): ").lower() == "yes"
+
+def choose(prompt, valid):
+    """Prompt until the user enters one of the valid options and return it."""
+    while True:
+        choice = read_input(prompt)
+        if choice in valid:
+            return choice
+        print(f"\nInvalid choice. Please enter {' or '.join(valid)}.")
+
 # Display security warning
-def show_security_warning():
+def show_security_warning(assume_yes=False):
     """Display warning message and get confirmation from user."""
-    print("\n⚠️  SECURITY AND STABILITY WARNING ⚠️")
-    print("This script will make changes to your Cursor IDE configuration:")
-    print("1. It can delete configuration files, which may remove your preferences")
-    print("2. It can modify identification settings which may affect licensing")
-    print("\nThese changes may have the following impacts:")
-    print("- Loss of preferences, settings, and history")
-    print("- Potential issues with future Cursor updates")
-    print("- Cursor might need to be reinstalled or reconfigured")
+    print(SECURITY_WARNING)
     
-    confirmation = input("\nDo you understand these risks and wish to continue? (yes/no): ").strip().lower()
-    if confirmation != "yes":
+    if not confirm("Do you understand these risks and wish to continue?", assume_yes):
         print("\nOperation cancelled by user")
         sys.exit(0)
 
 def check_cursor_installed():
     """Check if Cursor IDE is installed by looking for configuration files."""
-    config_path = os.path.expanduser("~/.config/Cursor/User/globalStorage/storage.json")
-    updater_path = os.path.expanduser("~/.config/cursor-updater")
-    
-    return os.path.exists(config_path) or os.path.exists(updater_path)
+    return os.path.exists(STORAGE_PATH) or os.path.exists(UPDATER_PATH)
 
 def create_directory_backup(directory):
     """Create a backup of a directory before deletion."""
@@ -35,12 +75,11 @@ def create_directory_backup(directory):
         return False
         
     # Create backups directory if it doesn't exist
-    backup_root = os.path.expanduser("~/cursor_config_backups")
-    os.makedirs(backup_root, exist_ok=True)
+    os.makedirs(BACKUP_ROOT, exist_ok=True)
     
     # Create timestamped backup directory
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_dir = f"{backup_root}/{os.path.basename(directory)}_{timestamp}"
+    backup_dir = f"{BACKUP_ROOT}/{os.path.basename(directory)}_{timestamp}"
     
     try:
         print(f"Creating backup of {directory} to {backup_dir}")
@@ -51,29 +90,21 @@ def create_directory_backup(directory):
         print(f"Error creating backup: {str(e)}")
         return False
 
-def delete_cursor_config_files():
+def delete_cursor_config_files(assume_yes=False):
     """Delete all Cursor-related configuration files with proper safeguards."""
-    directories = [
-        os.path.expanduser("~/.cursor"),
-        os.path.expanduser("~/.config/Cursor"),
-        os.path.expanduser("~/.config/cursor-updater")
-    ]
-
     # First, back up all directories
     backup_success = True
-    for directory in directories:
+    for directory in CONFIG_DIRECTORIES:
         if os.path.exists(directory):
             if not create_directory_backup(directory):
                 backup_success = False
     
-    if not backup_success:
-        confirm = input("\nSome backups failed. Continue with deletion anyway? (yes/no): ").strip().lower()
-        if confirm != "yes":
-            print("Operation canceled due to backup failures.")
-            return
+    if not backup_success and not confirm("Some backups failed. Continue with deletion anyway?", assume_yes):
+        print("Operation canceled due to backup failures.")
+        return
     
     # Then delete directories
-    for directory in directories:
+    for directory in CONFIG_DIRECTORIES:
         if os.path.exists(directory):
             print(f"Deleting directory: {directory}")
             try:
@@ -92,7 +123,7 @@ def generate_random_id():
 
 def modify_storage_json():
     """Modify the storage.json file with new random identifiers."""
-    storage_path = os.path.expanduser("~/.config/Cursor/User/globalStorage/storage.json")
+    storage_path = STORAGE_PATH
 
     if not os.path.exists(storage_path):
         print(f"Error: storage.json not found at {storage_path}")
@@ -100,9 +131,8 @@ def modify_storage_json():
 
     try:
         # Create backup first
-        backup_dir = os.path.expanduser("~/.config/Cursor/User/globalStorage/backups")
-        os.makedirs(backup_dir, exist_ok=True)
-        backup_path = f"{backup_dir}/storage.json.{datetime.now().strftime('%Y%m%d_%H%M%S')}.bak"
+        os.makedirs(STORAGE_BACKUP_DIR, exist_ok=True)
+        backup_path = f"{STORAGE_BACKUP_DIR}/storage.json.{datetime.now().strftime('%Y%m%d_%H%M%S')}.bak"
         shutil.copyfile(storage_path, backup_path)
         print(f"Created backup at: {backup_path}")
         
@@ -124,31 +154,26 @@ def modify_storage_json():
             "lastModified": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.000Z")
         })
         
-        # Save to temporary file first
+        # Save to temporary file first, then move it to the actual location
         temp_path = f"{storage_path}.temp"
-        with open(temp_path, "w") as file:
-            json.dump(data, file, indent=4)
-            
-        # Verify JSON is valid
         try:
-            with open(temp_path, "r") as file:
-                json.load(file)
-            # Move temp file to actual location if valid
+            with open(temp_path, "w") as file:
+                json.dump(data, file, indent=4)
             shutil.move(temp_path, storage_path)
-            print("Successfully updated storage.json")
-            
-            # Show the new IDs
-            print("\nNew configuration values:")
-            print(f"Machine ID: {machine_id}")
-            print(f"Device ID: {device_id}")
-            print(f"SQM ID: {sqm_id}")
-            
-        except json.JSONDecodeError:
-            print("Error: Generated file is corrupted, reverting from backup")
+        except OSError as e:
+            print(f"Error: Could not write storage.json ({e}), reverting from backup")
             shutil.copyfile(backup_path, storage_path)
             if os.path.exists(temp_path):
                 os.remove(temp_path)
             exit(1)
+
+        print("Successfully updated storage.json")
+        
+        # Show the new IDs
+        print("\nNew configuration values:")
+        print(f"Machine ID: {machine_id}")
+        print(f"Device ID: {device_id}")
+        print(f"SQM ID: {sqm_id}")
             
     except json.JSONDecodeError:
         print("Error: storage.json is corrupted or invalid")
@@ -157,9 +182,20 @@ def modify_storage_json():
         print(f"Error modifying storage.json: {str(e)}")
         exit(1)
 
+def parse_args():
+    """Parse command-line options for non-interactive use."""
+    parser = argparse.ArgumentParser(description="Reset or modify Cursor IDE configuration.")
+    parser.add_argument("--action", choices=["delete", "modify"],
+                        help="run this action directly instead of showing the menu")
+    parser.add_argument("-y", "--yes", action="store_true",
+                        help="answer yes to all confirmation prompts")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+
     # Show security warning first
-    show_security_warning()
+    show_security_warning(args.yes)
     
     print("Checking if Cursor IDE is installed...")
     if not check_cursor_installed():
@@ -167,31 +203,24 @@ def main():
         print("Please install Cursor first.")
         exit(0)
 
-    print("\nCursor IDE is installed. Choose an option:")
-    print("1. Remove all configuration files and uninstall Cursor")
-    print("2. Modify configuration settings (update storage.json with random IDs)")
+    choice = {"delete": "1", "modify": "2"}.get(args.action)
+    if choice is None:
+        print(MAIN_MENU)
+        choice = choose("\nEnter your choice (1 or 2): ", ("1", "2"))
     
-    while True:
-        choice = input("\nEnter your choice (1 or 2): ").strip()
-        
-        if choice == "1":
-            confirm = input("\nAre you sure you want to remove all Cursor configuration files? This will delete all settings and preferences. (yes/no): ").strip().lower()
-            if confirm == "yes":
-                print("\nRemoving all Cursor configuration files...")
-                delete_cursor_config_files()
-                print("\nAll Cursor configuration files have been removed.")
-                print("You can now reinstall Cursor if needed.")
-            else:
-                print("\nOperation canceled.")
-            break
-        elif choice == "2":
-            print("\nModifying storage.json with new random IDs...")
-            modify_storage_json()
-            print("\nConfiguration updated successfully.")
-            print("Please restart Cursor IDE for changes to take effect.")
-            break
+    if choice == "1":
+        if confirm("Are you sure you want to remove all Cursor configuration files? This will delete all settings and preferences.", args.yes):
+            print("\nRemoving all Cursor configuration files...")
+            delete_cursor_config_files(args.yes)
+            print("\nAll Cursor configuration files have been removed.")
+            print("You can now reinstall Cursor if needed.")
         else:
-            print("\nInvalid choice. Please enter 1 or 2.")
+            print("\nOperation canceled.")
+    else:
+        print("\nModifying storage.json with new random IDs...")
+        modify_storage_json()
+        print("\nConfiguration updated successfully.")
+        print("Please restart Cursor IDE for changes to take effect.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -105,13 +105,16 @@ verify_symlink() {
 create_shortcuts() {
     print_section "Processing Projects"
     
-    local count=$(ls -l "$SOURCE_DIR" | grep -c ^d)
+    # Count project directories with a glob instead of parsing ls output
+    local project_dirs=("$SOURCE_DIR"/*/)
+    [ -d "${project_dirs[0]}" ] || project_dirs=()
+    local count=${#project_dirs[@]}
     print_status "info" "Found ${BOLD}$count projects${NC} in source directory"
 
     for item in "$SOURCE_DIR"/*; do
         if [ -d "$item" ]; then
             ((TOTAL++))
-            local project_name=$(basename "$item")
+            local project_name="${item##*/}"
             local shortcut_path="$DESKTOP_DIR/$project_name"
 
             echo -e "\n${BOLD}Processing: ${BLUE}$project_name${NC}"
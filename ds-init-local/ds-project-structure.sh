@@ -1205,24 +1205,34 @@ When creating a new notebook, start with this basic structure:
 create_structure() {
   print_creating "project directory structure"
   
+  # Collect paths first, then create them with one mkdir and one touch
+  local dirs=() files=()
+  
   for entry in "${DEFAULT_STRUCTURE[@]}"; do
-    path="${PROJECT_NAME}/$(echo "$entry" | cut -d'#' -f1 | xargs)"
-    comment=$(echo "$entry" | cut -d'#' -f2-)
-    
+    # Split "path  # comment" with parameter expansion (no subshells per entry)
+    local rel="${entry%%#*}"
+    rel="${rel#"${rel%%[![:space:]]*}"}"
+    rel="${rel%"${rel##*[![:space:]]}"}"
+    path="${PROJECT_NAME}/${rel}"
+    comment="${entry#*#}"
+
     if [[ "$path" == *"__init__.py" ]]; then
-      mkdir -p "$(dirname "$path")"
-      touch "$path"
+      dirs+=("${path%/*}")
+      files+=("$path")
       print_success "Python module: $path"
     elif [[ "$path" == *.* ]]; then
-      touch "$path"
+      files+=("$path")
       print_success "File: $path"
     else
-      mkdir -p "$path"
+      dirs+=("$path")
       # Add .gitkeep file to ensure empty directories are tracked by Git
-      touch "${path}/.gitkeep"
+      files+=("${path}/.gitkeep")
       print_success "Directory: $path ${MAGENTA}${comment}${NC}"
     fi
   done
+  
+  mkdir -p "${dirs[@]}"
+  touch "${files[@]}"
 }
 
 create_files() {
@@ -15,9 +15,9 @@ Date: February 2024
 
 import os
 import json
+import hashlib
 import shutil
 import subprocess
-import requests
 import tarfile
 import platform
 from pathlib import Path
@@ -37,6 +37,9 @@ def ensure_dsi_config_dir():
     dsi_config_dir.mkdir(exist_ok=True)
     return dsi_config_dir
 
+# (connect, read) timeouts in seconds for all HTTP requests
+HTTP_TIMEOUT = (5, 30)
+
 def get_vscode_download_url():
     """
     Determines the appropriate VSCode download URL based on the system architecture.
@@ -64,6 +67,7 @@ def download_vscode():
     """
     Downloads VSCode from the official website.
     Creates a downloads directory in .dsi-config and saves the archive there.
+    Uses aria2c with parallel connections when available, otherwise requests.
 
     Returns:
         Path: Path to the downloaded VSCode archive
@@ -76,17 +80,88 @@ def download_vscode():
     downloads_dir = dsi_config_dir / 'downloads'
     downloads_dir.mkdir(exist_ok=True)
 
-    # Download VSCode with progress handling
-    response = requests.get(url, stream=True)
     tar_path = downloads_dir / 'vscode.tar.gz'
 
-    with open(tar_path, 'wb') as f:
-        for chunk in response.iter_content(chunk_size=8192):
+    # Prefer aria2c's multi-connection download when it is installed
+    aria2c = shutil.which('aria2c')
+    if aria2c:
+        result = subprocess.run([aria2c, '-x', '8', '-s', '8', '--allow-overwrite=true',
+                                 '--auto-file-renaming=false', '-d', str(downloads_dir),
+                                 '-o', tar_path.name, url])
+        if result.returncode == 0:
+            return tar_path
+        print("aria2c download failed, falling back to a single-stream download...")
+        # Remove partial output so a later run can't mistake it for a complete archive
+        tar_path.unlink(missing_ok=True)
+        tar_path.with_name(tar_path.name + '.aria2').unlink(missing_ok=True)
+
+    # Imported here so runs that never download skip loading requests/urllib3
+    import requests
+
+    # Download VSCode with progress handling
+    response = requests.get(url, stream=True, timeout=HTTP_TIMEOUT)
+
+    with open(tar_path, 'wb', buffering=1024 * 1024) as f:
+        for chunk in response.iter_content(chunk_size=128 * 1024):
             if chunk:
                 f.write(chunk)
 
     return tar_path
 
+def find_vscode_archive(dsi_config_dir):
+    """
+    Looks for an existing VSCode archive in the project root and in .dsi-config/downloads.
+    Uses os.scandir so directory entries are checked by name without building
+    intermediate Path lists, and stops at the first match.
+
+    Args:
+        dsi_config_dir (Path): Path to the .dsi-config directory
+
+    Returns:
+        Path: Path to the first archive found, None otherwise
+    """
+    for directory in (Path('.'), dsi_config_dir / 'downloads'):
+        if not directory.is_dir():
+            continue
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith('.tar.gz') and entry.is_file():
+                    return directory / entry.name
+    return None
+
+# Buffer size for copying archive members and reading the pigz pipe; tarfile's
+# 16 KiB default turns large files into tens of thousands of small reads/writes
+TAR_COPY_BUFSIZE = 2 * 1024 * 1024
+
+def extract_archive(tar_path, dest_dir):
+    """
+    Extracts a .tar.gz archive into the given directory.
+    When pigz is installed, decompression runs in a separate pigz process and
+    tarfile reads the plain tar stream from its stdout, so inflating and
+    writing files overlap. Otherwise tarfile's built-in gzip support is used.
+
+    Args:
+        tar_path (Path): Path to the .tar.gz archive
+        dest_dir (Path): Directory to extract into
+    """
+    # Use tarfile's recommended 'data' filter where supported: it rejects
+    # absolute paths and links escaping dest_dir, and strips special modes
+    extract_kwargs = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+
+    pigz = shutil.which('pigz')
+    if pigz is None:
+        with tarfile.open(tar_path, 'r:gz', copybufsize=TAR_COPY_BUFSIZE) as tar:
+            tar.extractall(dest_dir, **extract_kwargs)
+        return
+
+    with subprocess.Popen([pigz, '-dc', str(tar_path)], stdout=subprocess.PIPE,
+                          bufsize=TAR_COPY_BUFSIZE) as proc:
+        with tarfile.open(fileobj=proc.stdout, mode='r|', bufsize=TAR_COPY_BUFSIZE,
+                          copybufsize=TAR_COPY_BUFSIZE) as tar:
+            tar.extractall(dest_dir, **extract_kwargs)
+    if proc.returncode != 0:
+        raise tarfile.ReadError(f"pigz failed to decompress {tar_path}")
+
 def setup_portable_vscode():
     """
     Sets up a portable installation of VSCode.
@@ -105,30 +180,30 @@ def setup_portable_vscode():
         return
 
     # Look for existing archive
-    tar_files = list(Path('.').glob('*.tar.gz')) + list(dsi_config_dir.glob('downloads/*.tar.gz'))
+    tar_path = find_vscode_archive(dsi_config_dir)
 
-    if not tar_files:
+    if tar_path is None:
         print("No VSCode archive found. Downloading...")
         tar_path = download_vscode()
     else:
-        tar_path = tar_files[0]
         print(f"Found existing VSCode archive: {tar_path}")
 
     # Extract VSCode
     print("Extracting VSCode...")
-    with tarfile.open(tar_path, 'r:gz') as tar:
-        # Use temporary directory for extraction
-        temp_dir = dsi_config_dir / 'temp'
-        temp_dir.mkdir(exist_ok=True)
-        tar.extractall(temp_dir)
-
-        # Move to final location
-        extracted_dir = next(temp_dir.glob('VSCode-*'), None)
-        if extracted_dir:
-            if vscode_dir.exists():
-                shutil.rmtree(vscode_dir)
-            shutil.move(str(extracted_dir), str(vscode_dir))
-            shutil.rmtree(temp_dir)
+    # Use temporary directory for extraction
+    temp_dir = dsi_config_dir / 'temp'
+    temp_dir.mkdir(exist_ok=True)
+    extract_archive(tar_path, temp_dir)
+
+    # Move to final location
+    with os.scandir(temp_dir) as entries:
+        extracted_dir = next((Path(entry.path) for entry in entries
+                              if entry.name.startswith('VSCode-') and entry.is_dir()), None)
+    if extracted_dir:
+        if vscode_dir.exists():
+            shutil.rmtree(vscode_dir)
+        shutil.move(str(extracted_dir), str(vscode_dir))
+        shutil.rmtree(temp_dir)
 
     # Setup portable mode
     data_dir = vscode_dir / 'data'
@@ -159,13 +234,16 @@ def get_extension_download_url(extension_id):
         'Accept-Encoding': 'gzip, deflate, br'
     }
 
+    # Imported here so runs that never download skip loading requests/urllib3
+    import requests
+
     try:
         # Get version info first
         info_url = f"https://marketplace.visualstudio.com/_apis/public/gallery/publishers/{publisher}/vsextensions/{extension_name}/latest"
-        info_response = requests.get(info_url, headers=headers)
+        info_response = requests.get(info_url, headers=headers, timeout=HTTP_TIMEOUT)
         if info_response.status_code == 200:
             # Download the extension package
-            download_response = requests.get(url, headers={'User-Agent': headers['User-Agent'], 'Accept': '*/*'})
+            download_response = requests.get(url, headers={'User-Agent': headers['User-Agent'], 'Accept': '*/*'}, timeout=HTTP_TIMEOUT)
             if download_response.status_code == 200:
                 return download_response.content
     except Exception as e:
@@ -256,6 +334,28 @@ def get_conda_env_path():
     """
     return os.path.abspath(os.path.join('.conda-env'))
 
+def get_conda_env_python():
+    """
+    Gets the path to the Python interpreter inside the conda environment.
+
+    Returns:
+        str: Absolute path to the environment's python executable
+    """
+    return os.path.join(get_conda_env_path(), 'bin', 'python')
+
+def get_conda_executable():
+    """
+    Resolves the conda executable from PATH.
+
+    Returns:
+        str: Absolute path to the conda executable
+    """
+    conda = shutil.which('conda')
+    if conda is None:
+        print("Could not find conda on PATH. Please install Miniconda or Anaconda first.")
+        sys.exit(1)
+    return conda
+
 def create_project_structure():
     """
     Creates a standardized data science project structure.
@@ -394,68 +494,81 @@ def setup_python_environment():
 
     # Create fresh conda environment if needed
     if not os.path.exists(os.path.join(env_path, 'conda-meta')):
-        subprocess.run(['conda', 'create', '--prefix', env_path, 'python=3.11', 'ipykernel', 'jupyter', '-y'])
+        result = subprocess.run([get_conda_executable(), 'create', '--prefix', env_path, 'python=3.11', 'ipykernel', 'jupyter', '-y'])
+        if result.returncode != 0:
+            print("Failed to create the conda environment. Please check the conda output above.")
+            sys.exit(1)
 
         # Install IPython kernel
-        subprocess.run(['conda', 'run', '--prefix', env_path, 'python', '-m', 'ipykernel', 'install', '--user', '--name', 'local-env', '--display-name', 'Python (Local Env)'])
+        subprocess.run([get_conda_env_python(), '-m', 'ipykernel', 'install', '--user', '--name', 'local-env', '--display-name', 'Python (Local Env)'])
 
     # Create requirements.txt with essential packages
     dsi_config_dir = ensure_dsi_config_dir()
     requirements_path = dsi_config_dir / 'requirements.txt'
     if not requirements_path.exists():
+        requirements_content = """# Core data science packages
+numpy>=1.24.0
+pandas>=2.0.0
+matplotlib>=3.7.0
+seaborn>=0.12.0
+#plotly>=5.13.0
+
+# Machine Learning
+scikit-learn>=1.2.0
+#tensorflow>=2.12.0
+#torch>=2.0.0
+
+# Deep Learning Utils
+#tensorboard>=2.12.0
+#torchvision>=0.15.0
+
+# Data Processing
+#scipy>=1.10.0
+#statsmodels>=0.13.5
+#pyarrow>=11.0.0
+
+# Development Tools
+jupyter>=1.0.0
+ipykernel>=6.21.0
+black>=23.1.0
+isort>=5.12.0
+pytest>=7.3.0
+pylint>=2.17.0
+
+# Web Apps
+#streamlit>=1.17.0
+#dash>=2.8.0
+
+# Utilities
+tqdm>=4.64.1
+requests>=2.28.2
+python-dotenv>=0.21.1
+"""
         with open(requirements_path, 'w') as f:
-            f.write('# Core data science packages\n')
-            f.write('numpy>=1.24.0\n')
-            f.write('pandas>=2.0.0\n')
-            f.write('matplotlib>=3.7.0\n')
-            f.write('seaborn>=0.12.0\n')
-            f.write('#plotly>=5.13.0\n')
-            f.write('\n# Machine Learning\n')
-            f.write('scikit-learn>=1.2.0\n')
-            f.write('#tensorflow>=2.12.0\n')
-            f.write('#torch>=2.0.0\n')
-            f.write('\n# Deep Learning Utils\n')
-            f.write('#tensorboard>=2.12.0\n')
-            f.write('#torchvision>=0.15.0\n')
-            f.write('\n# Data Processing\n')
-            f.write('#scipy>=1.10.0\n')
-            f.write('#statsmodels>=0.13.5\n')
-            f.write('#pyarrow>=11.0.0\n')
-            f.write('\n# Development Tools\n')
-            f.write('jupyter>=1.0.0\n')
-            f.write('ipykernel>=6.21.0\n')
-            f.write('black>=23.1.0\n')
-            f.write('isort>=5.12.0\n')
-            f.write('pytest>=7.3.0\n')
-            f.write('pylint>=2.17.0\n')
-            f.write('\n# Web Apps\n')
-            f.write('#streamlit>=1.17.0\n')
-            f.write('#dash>=2.8.0\n')
-            f.write('\n# Utilities\n')
-            f.write('tqdm>=4.64.1\n')
-            f.write('requests>=2.28.2\n')
-            f.write('python-dotenv>=0.21.1\n')
+            f.write(requirements_content)
 
     # Create environment.yml for conda
     environment_path = dsi_config_dir / 'environment.yml'
     if not environment_path.exists():
+        environment_content = """name: ds-env
+channels:
+  - conda-forge
+  - defaults
+dependencies:
+  - python=3.11
+  - pip
+  - numpy
+  - pandas
+  - scikit-learn
+  - matplotlib
+  - seaborn
+  - jupyter
+  - ipykernel
+  - pip:
+    - -r requirements.txt
+"""
         with open(environment_path, 'w') as f:
-            f.write('name: ds-env\n')
-            f.write('channels:\n')
-            f.write('  - conda-forge\n')
-            f.write('  - defaults\n')
-            f.write('dependencies:\n')
-            f.write('  - python=3.11\n')
-            f.write('  - pip\n')
-            f.write('  - numpy\n')
-            f.write('  - pandas\n')
-            f.write('  - scikit-learn\n')
-            f.write('  - matplotlib\n')
-            f.write('  - seaborn\n')
-            f.write('  - jupyter\n')
-            f.write('  - ipykernel\n')
-            f.write('  - pip:\n')
-            f.write('    - -r requirements.txt\n')
+            f.write(environment_content)
 
 def create_vscode_portable_setup():
     # Create .vscode directory in project root
@@ -662,6 +775,60 @@ cd "$SCRIPT_DIR/.."
     with open(dsi_config_dir / 'workspace.code-workspace', 'w') as f:
         json.dump(workspace_config, f, indent=4)
 
+# Static parts of the generated install-extensions.sh; only the extension
+# list between them changes from run to run
+EXTENSION_INSTALL_SCRIPT_HEADER = """#!/bin/bash
+SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
+cd "$SCRIPT_DIR/.."
+VSCODE_DIR="./.dsi-config/vscode"
+EXTENSIONS_DIR="$VSCODE_DIR/data/extensions"
+USER_DATA_DIR="$VSCODE_DIR/data"
+
+echo "Installing VSCode extensions..."
+
+# Set environment variables for CLI mode
+export VSCODE_CLI=1
+export ELECTRON_RUN_AS_NODE=1
+export ELECTRON_NO_ATTACH_CONSOLE=1
+
+# Function to install all extensions in a single CLI invocation
+install_extensions() {
+    local code_bin
+
+    # Try different possible VSCode executable locations
+    if [ -f "$VSCODE_DIR/bin/code" ]; then
+        code_bin="$VSCODE_DIR/bin/code"
+    elif [ -f "$VSCODE_DIR/code" ]; then
+        code_bin="$VSCODE_DIR/code"
+    else
+        echo "Could not find VSCode executable"
+        return 1
+    fi
+
+    local args=()
+    for extension in "$@"; do
+        echo "Installing $extension..."
+        args+=(--install-extension "$extension")
+    done
+
+    if "$code_bin" "${args[@]}" \\
+        --extensions-dir "$EXTENSIONS_DIR" \\
+        --user-data-dir "$USER_DATA_DIR"; then
+        echo "Successfully installed all extensions"
+    else
+        echo "Failed to install one or more extensions"
+    fi
+}
+
+# Create extensions directory if it doesn't exist
+mkdir -p "$EXTENSIONS_DIR"
+"""
+
+EXTENSION_INSTALL_SCRIPT_FOOTER = """
+echo "Extension installation completed!"
+echo "Please restart VSCode to activate all extensions."
+"""
+
 def create_extension_install_script(vscode_dir):
     print("\nCreating extension installation script...")
     extensions = [
@@ -697,61 +864,14 @@ def create_extension_install_script(vscode_dir):
         "yzhang.markdown-all-in-one"
     ]
 
-    # Create the installation script
-    install_script = """#!/bin/bash
-SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
-cd "$SCRIPT_DIR/.."
-VSCODE_DIR="./.dsi-config/vscode"
-EXTENSIONS_DIR="$VSCODE_DIR/data/extensions"
-USER_DATA_DIR="$VSCODE_DIR/data"
-
-echo "Installing VSCode extensions..."
-
-# Set environment variables for CLI mode
-export VSCODE_CLI=1
-export ELECTRON_RUN_AS_NODE=1
-export ELECTRON_NO_ATTACH_CONSOLE=1
-
-# Function to install extension
-install_extension() {
-    local extension=$1
-    echo "Installing $extension..."
-
-    # Try different possible VSCode executable locations
-    if [ -f "$VSCODE_DIR/bin/code" ]; then
-        "$VSCODE_DIR/bin/code" --install-extension "$extension" \\
-            --extensions-dir "$EXTENSIONS_DIR" \\
-            --user-data-dir "$USER_DATA_DIR"
-    elif [ -f "$VSCODE_DIR/code" ]; then
-        "$VSCODE_DIR/code" --install-extension "$extension" \\
-            --extensions-dir "$EXTENSIONS_DIR" \\
-            --user-data-dir "$USER_DATA_DIR"
-    else
-        echo "Could not find VSCode executable"
-        return 1
-    fi
-
-    if [ $? -eq 0 ]; then
-        echo "Successfully installed $extension"
-    else
-        echo "Failed to install $extension"
-    fi
-
-    sleep 1
-}
-
-# Create extensions directory if it doesn't exist
-mkdir -p "$EXTENSIONS_DIR"
-"""
-
-    # Add extension installations
-    for extension in extensions:
-        install_script += f'install_extension "{extension}"\n'
-
-    install_script += """
-echo "Extension installation completed!"
-echo "Please restart VSCode to activate all extensions."
-"""
+    # Fill the static template with a single batched install call
+    install_script = ''.join([
+        EXTENSION_INSTALL_SCRIPT_HEADER,
+        'install_extensions \\\n    ',
+        ' \\\n    '.join(f'"{extension}"' for extension in extensions),
+        '\n',
+        EXTENSION_INSTALL_SCRIPT_FOOTER,
+    ])
 
     # Save the script in .dsi-config directory
     dsi_config_dir = ensure_dsi_config_dir()
@@ -765,6 +885,37 @@ echo "Please restart VSCode to activate all extensions."
     print("Created install-extensions.sh script in .dsi-config directory.")
     print("After launching VSCode, run this script to install all extensions.")
 
+def install_requirements(requirements_path):
+    """
+    Installs the project requirements into the conda environment.
+    Uses uv when it is available, since it resolves and installs much faster
+    than pip; otherwise falls back to the environment's own pip.
+    A stamp file in the environment records a hash of the installed
+    requirements, so re-runs with unchanged requirements skip the install.
+
+    Args:
+        requirements_path (Path): Path to the requirements.txt file
+    """
+    stamp_path = Path(get_conda_env_path()) / '.requirements.sha256'
+    digest = hashlib.sha256(Path(requirements_path).read_bytes()).hexdigest()
+    if stamp_path.exists() and stamp_path.read_text() == digest:
+        print("Requirements are already installed, skipping.")
+        return
+
+    env_python = get_conda_env_python()
+    if not os.path.exists(env_python):
+        print(f"Python interpreter not found in conda environment: {env_python}")
+        sys.exit(1)
+
+    uv = shutil.which('uv')
+    if uv:
+        result = subprocess.run([uv, 'pip', 'install', '--python', env_python, '-r', str(requirements_path)])
+    else:
+        result = subprocess.run([env_python, '-m', 'pip', 'install', '--disable-pip-version-check', '--no-input', '--prefer-binary', '-r', str(requirements_path)])
+
+    if result.returncode == 0:
+        stamp_path.write_text(digest)
+
 def main():
     print("Setting up portable VSCode environment...")
 
@@ -774,10 +925,10 @@ def main():
     # Setup Python environment
     setup_python_environment()
 
-    # Install required packages using conda
+    # Install required packages into the conda environment
     env_path = get_conda_env_path()
     dsi_config_dir = ensure_dsi_config_dir()
-    subprocess.run(['conda', 'run', '--prefix', env_path, 'pip', 'install', '-r', str(dsi_config_dir / 'requirements.txt')])
+    install_requirements(dsi_config_dir / 'requirements.txt')
 
     # Setup VSCode
     setup_portable_vscode()
@@ -785,14 +936,17 @@ def main():
     create_launch_script()
     create_extension_install_script(ensure_dsi_config_dir() / 'vscode')
 
-    print("\nPortable VSCode setup completed!")
-    print("\nRecommended next steps:")
-    print("1. Launch VSCode using: ./.dsi-config/launch-vscode.sh")
-    print("2. Install extensions by running: ./.dsi-config/install-extensions.sh")
-    print(f"3. Activate conda environment: conda activate {env_path}")
-    print("4. Install required packages: pip install -r .dsi-config/requirements.txt")
-    print("\nProject structure has been created with data science best practices.")
-    print("Check README.md for more information about the project structure.")
+    print(f"""
+Portable VSCode setup completed!
+
+Recommended next steps:
+1. Launch VSCode using: ./.dsi-config/launch-vscode.sh
+2. Install extensions by running: ./.dsi-config/install-extensions.sh
+3. Activate conda environment: conda activate {env_path}
+4. Install required packages: pip install -r .dsi-config/requirements.txt
+
+Project structure has been created with data science best practices.
+Check README.md for more information about the project structure.""")
 
     # Move this script to .dsi-config folder
     current_script = Path(__file__).resolve()